@@ -22,11 +22,17 @@ los resultados y cómo se registran en el fichero de log.
 
 import os
 import re
+import sys
 import unicodedata
+import atexit
+import functools
+import heapq
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 from datetime import datetime
 from collections import Counter
+from operator import itemgetter
 
 # Dependencias NLP
 try:
@@ -46,29 +52,54 @@ except ImportError:
 # ----------------------
 # Recursos compartidos (caché global)
 # ----------------------
-# Cargar stopwords de forma global para evitar costoso recálculo por llamada
+# Cargar stopwords de forma global para evitar costoso recálculo por llamada.
+# Se guardan ya normalizadas (NFKC + casefold) igual que los tokens, en un
+# `frozenset` inmutable que se comparte entre ambas ramas de tokenización
 _stopwords_es = None
 if nltk and stopwords:
     try:
         nltk.data.find('corpora/stopwords')
     except LookupError:
         nltk.download('stopwords')
-    _stopwords_es = set(stopwords.words('spanish'))
+    _stopwords_es = frozenset(unicodedata.normalize('NFKC', w).casefold() for w in stopwords.words('spanish'))
 else:
-    _stopwords_es = set()
+    _stopwords_es = frozenset()
 
-# Intentar cargar spaCy si está disponible
+# Patrón de token precompilado: se reutiliza en cada llamada en vez de
+# despachar `re.fullmatch`/`re.findall` con el patrón literal por token
+_TOKEN_RE = re.compile(r"[\w\-áéíóúñü]+")
+
+# Modelo spaCy cargado bajo demanda (ver `_get_nlp`): importar el módulo
+# no paga el coste de `spacy.load` si nunca se usan las funciones NLP
 _nlp = None
-if spacy:
-    try:
-        _nlp = spacy.load('es_core_news_sm')
-    except Exception:
-        # Si el modelo no está instalado, no fallamos; dejamos _nlp en None
-        _nlp = None
+
+
+def _get_nlp():
+    """
+    Devuelve el modelo `es_core_news_sm`, cargándolo en la primera llamada.
+
+    Se desactivan los componentes que no se usan (`ner`, `textcat`); el
+    parser se mantiene porque `doc.noun_chunks` lo necesita. Si spaCy o el
+    modelo no están disponibles, se recuerda el fallo y se devuelve `None`
+    sin volver a intentarlo.
+    """
+    global _nlp
+    if _nlp is None and spacy is not None:
+        try:
+            _nlp = spacy.load('es_core_news_sm', disable=['ner', 'textcat'])
+        except Exception:
+            # Si el modelo no está instalado, no fallamos en cada llamada
+            _nlp = False
+    return _nlp or None
 
 # ----------------------
 # SessionLogger (mejora 1)
 # ----------------------
+# Formato de registro: `created` es un float ya calculado en cada LogRecord,
+# mucho más barato que formatear `asctime` con `strftime`
+_LOG_FORMAT = '%(created).3f|%(levelname)s|%(message)s'
+
+
 class SessionLogger:
     """
     Logger de sesión basado en `logging` con rotación de archivos.
@@ -84,6 +115,13 @@ class SessionLogger:
         - Crear la carpeta `logs/` si no existe (seguridad con `exist_ok=True`).
         - Usar `RotatingFileHandler` para que los archivos no crezcan
           indefinidamente (`max_bytes` y `backup_count`).
+        - Escribir en disco desde un hilo aparte: el logger solo encola
+          los registros (`QueueHandler`) y un `QueueListener` los vuelca al
+          fichero, de modo que `log(...)` no espera a la escritura. El
+          listener se detiene (y vacía la cola) al salir del programa.
+        - Agrupar escrituras con un `MemoryHandler` (hasta 512 registros o
+          hasta el primer ERROR) delante del `RotatingFileHandler`; el búfer
+          se vacía también al salir.
         - Proveer métodos sencillos `log(...)` y `error(...)` para mantener
           una API similar al logger anterior y reducir cambios en llamadas.
 
@@ -96,15 +134,17 @@ class SessionLogger:
         log(action: str, input_snippet: str, result):
             - Registra un evento en nivel INFO. `input_snippet` se recorta a
               120 caracteres para evitar filtrar datos sensibles o muy largos.
-            - `result` se intenta serializar con `repr()`; si falla, se
-              escribe un mensaje alternativo.
+            - `result` se serializa con `%r` de forma diferida: si el nivel
+              INFO está desactivado no se llega a formatear.
 
         error(message: str):
             - Registra un mensaje en nivel ERROR.
 
     Formato y extensibilidad:
-        - Las entradas usan un `Formatter` con timestamp ISO y nivel, lo que
-          facilita su parsing posterior y su visualización en herramientas.
+        - Las entradas usan `_LOG_FORMAT`: timestamp epoch con milisegundos
+          (`%(created).3f`, sin pasar por `strftime` en cada registro), nivel
+          y mensaje separados por `|`, fácil de parsear y de convertir a
+          fecha legible en herramientas externas.
         - Al usar la API de `logging`, es sencillo reenviar estos mensajes a
           otros handlers (stdout, syslog, Elastic, etc.) sin cambiar el
           código llamador.
@@ -114,6 +154,8 @@ class SessionLogger:
         >>> logger.log('Extracción', 'fragmento...', {'top': [('palabra', 2)]})
     """
 
+    __slots__ = ('logger', 'filename', '_listener')
+
     def __init__(self, logs_dir='logs', max_bytes=5_000_000, backup_count=5):
         os.makedirs(logs_dir, exist_ok=True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -123,11 +165,21 @@ class SessionLogger:
         self.logger.setLevel(logging.INFO)
 
         # Evitar añadir múltiples handlers si se instancia varias veces
+        self._listener = None
         if not self.logger.handlers:
             handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%dT%H:%M:%S')
+            formatter = logging.Formatter(_LOG_FORMAT)
             handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            # Los registros INFO se acumulan en memoria y se vuelcan al
+            # fichero en bloques; un ERROR fuerza el volcado inmediato
+            buffered = MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=handler)
+            atexit.register(buffered.close)
+            # El hilo del listener hace la escritura; el llamador solo encola
+            queue = SimpleQueue()
+            self._listener = QueueListener(queue, buffered, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            self.logger.addHandler(QueueHandler(queue))
 
         self.filename = filename
 
@@ -136,14 +188,13 @@ class SessionLogger:
 
         - Se recorta `input_snippet` a 120 caracteres para evitar registrar datos
           largos o sensibles accidentalmente.
-        - `result` serializable a string se incluye en la línea de log.
+        - `result` se incluye con `%r`; `logging` solo lo formatea si el
+          registro llega a emitirse.
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         snippet = (input_snippet or '')[:120]
-        try:
-            self.logger.info('%s | Entrada: %s | Resultado: %s', action, snippet, repr(result))
-        except Exception:
-            # Fallback sencillo si la serialización falla
-            self.logger.info('%s | Entrada: %s | Resultado (no serializable)', action, snippet)
+        self.logger.info('%s | Entrada: %s | Resultado: %r', action, snippet, result)
 
     def error(self, message: str):
         self.logger.error(message)
@@ -155,26 +206,250 @@ logger = SessionLogger()
 # ----------------------
 # Función: extraer_palabras_clave (mejora 2)
 # ----------------------
-def _normalize_text(text: str) -> str:
+def _nfkc(text: str) -> str:
+    """
+    Devuelve `text` en NFKC, evitando copiarlo si ya lo está.
+
+    NFKC reduce variaciones de codificación que afectan a la tokenización.
+    Camino rápido: el texto ASCII ya está en NFKC, y para el resto se usa
+    `unicodedata.is_normalized` (Quick-Check de Unicode) antes de pagar la
+    normalización completa y la copia del texto. El conteo de tokens aplica
+    después `casefold()` sobre este resultado.
     """
-    Normaliza texto para comparación y tokenización.
+    if text.isascii() or unicodedata.is_normalized('NFKC', text):
+        return text
+    return unicodedata.normalize('NFKC', text)
 
-    Detalles:
-        - Normaliza la representación Unicode usando `NFKC` para reducir
-          variaciones en la codificación que pueden afectar a la tokenización.
-        - Aplica `casefold()` para una comparación insensible a mayúsculas
-          y más robusta que `lower()` en contextos multilingües.
 
-    Args:
-        text (str): Texto de entrada.
+@functools.lru_cache(maxsize=100_000)
+def _token_valido(tok: str) -> bool:
+    """
+    Indica si un token cuenta para `top_5_palabras`.
+
+    Se descartan tokens de menos de 3 caracteres, stopwords y tokens que no
+    encajan con `_TOKEN_RE`. El resultado se cachea por token, de modo que
+    el filtrado cuesta una vez por palabra única y no por aparición.
+    """
+    return len(tok) > 2 and tok not in _stopwords_es and _TOKEN_RE.fullmatch(tok) is not None
+
+
+def _contar_tokens(texto_norm: str, top_n: int):
+    """
+    Cuenta los tokens más frecuentes de un texto ya normalizado.
+
+    Usa `word_tokenize` de NLTK si está disponible y, si no, la expresión
+    regular `_TOKEN_RE`. Se descartan stopwords y tokens de menos de 3
+    caracteres.
+
+    Returns:
+        list[tuple(str, int)]: los `top_n` tokens más frecuentes.
+    """
+    if nltk and word_tokenize:
+        tokens = word_tokenize(texto_norm)
+    else:
+        # Fallback: tokenizar por palabra simple
+        tokens = _TOKEN_RE.findall(texto_norm)
+    # Referencia local: evita la búsqueda global por token
+    valido = _token_valido
+    return Counter(t for t in tokens if valido(t)).most_common(top_n)
+
+
+def _resolver_lemas(conteo_ids: Counter, strings) -> Counter:
+    """
+    Convierte un `Counter` de ids de lema de spaCy en uno de lemas en texto.
+
+    Aplica `casefold()` y descarta lemas de menos de 3 caracteres; los ids
+    que comparten forma tras el casefold suman sus frecuencias.
+    """
+    conteo = Counter()
+    for lemma_id, freq in conteo_ids.items():
+        lem = strings[lemma_id]
+        if len(lem) > 2:
+            conteo[lem.casefold()] += freq
+    return conteo
+
+
+def _analizar_doc(doc, top_n: int, top_phrases: int):
+    """
+    Extrae sustantivos, verbos y frases clave de un `Doc` de spaCy ya procesado.
 
     Returns:
-        str: Texto normalizado; devuelve cadena vacía si la entrada no es `str`.
+        tuple: (sustantivos, verbos, frases_clave) con el mismo formato que
+        las claves homónimas de `extraer_palabras_clave`.
     """
-    if not isinstance(text, str):
-        return ''
-    nfkd = unicodedata.normalize('NFKC', text)
-    return nfkd.casefold()
+    # Una sola pasada sobre `doc` para sustantivos y verbos; se usan
+    # lemas para agrupar formas flexionadas. Se cuenta por el id entero del
+    # lema (`token.lemma`) y solo se convierte a texto una vez por lema único
+    noun_ids, verb_ids = Counter(), Counter()
+    for token in doc:
+        pos = token.pos_
+        if pos == 'NOUN':
+            noun_ids[token.lemma] += 1
+        elif pos == 'VERB':
+            verb_ids[token.lemma] += 1
+    strings = doc.vocab.strings
+    sustantivos_relevantes = _resolver_lemas(noun_ids, strings).most_common(top_n)
+    verbos_principales = _resolver_lemas(verb_ids, strings).most_common(top_n)
+
+    if top_phrases <= 0:
+        # Sin frases pedidas el parser puede estar desactivado y
+        # `doc.noun_chunks` no estaría disponible
+        return sustantivos_relevantes, verbos_principales, []
+
+    # Contar ocurrencias de noun_chunks por tupla de ids de lema (sin
+    # stopwords ni tokens no alfabéticos); el texto canónico solo se
+    # construye una vez por frase única
+    chunk_ids = Counter()
+    for chunk in doc.noun_chunks:
+        key = tuple(t.lemma for t in chunk if not t.is_stop and t.is_alpha)
+        if key:
+            chunk_ids[key] += 1
+
+    phrase_counter = Counter()
+    for key, freq in chunk_ids.items():
+        phrase_lemmas = ' '.join(strings[h].casefold() for h in key)
+        if len(phrase_lemmas) < 3:
+            continue
+        phrase_counter[phrase_lemmas] += freq
+
+    # Preparar lista y aplicar puntuación que prioriza frases multi-palabra
+    sustantivos_top = {s for s, _ in sustantivos_relevantes}
+    scored_phrases = []
+    for phrase, freq in phrase_counter.items():
+        words = phrase.split()
+        num_words = len(words)
+        contains_top_noun = 1 if sustantivos_top.intersection(words) else 0
+        # Fórmula simple: frecuencia * (1 + 0.5 * (num_words - 1)) + 0.2 * contains_top_noun
+        score = freq * (1 + 0.5 * (num_words - 1)) + 0.2 * contains_top_noun
+        scored_phrases.append((phrase, round(score, 3)))
+
+    # `nlargest` equivale a `sorted(..., reverse=True)[:k]` sin ordenar todo
+    frases_clave = heapq.nlargest(top_phrases, scored_phrases, key=itemgetter(1))
+    return sustantivos_relevantes, verbos_principales, frases_clave
+
+
+def _es_trivial(texto: str) -> bool:
+    """
+    Indica si `texto` es demasiado corto o no tiene letras.
+
+    Para estas entradas (p. ej. una sola palabra corta o solo números) se
+    devuelve un resultado vacío sin pasar por NLTK ni spaCy.
+    """
+    return len(texto.strip()) < 4 or not any(c.isalpha() for c in texto)
+
+
+class KeywordExtractor:
+    """
+    Extractor de palabras y frases clave reutilizable entre llamadas.
+
+    Guarda el objeto spaCy una sola vez para que el procesamiento de muchos
+    textos cortos no repita la preparación en cada llamada; las constantes
+    compartidas (`_TOKEN_RE`, `_stopwords_es`) ya viven a nivel de módulo.
+    `extraer_palabras_clave` y `extraer_palabras_clave_batch` son envolturas
+    finas sobre una instancia memorizada (ver `_get_extractor`).
+
+    Ejemplo:
+        >>> extractor = KeywordExtractor(nlp=_get_nlp())
+        >>> extractor('El procesamiento del lenguaje natural...')
+    """
+
+    __slots__ = ('nlp',)
+
+    def __init__(self, nlp=None):
+        self.nlp = nlp
+
+    def __call__(self, texto: str, top_n=5, top_phrases=6):
+        """Equivale a `extraer_palabras_clave(texto, self.nlp, ...)`."""
+        if not texto or not isinstance(texto, str) or not texto.strip():
+            return None
+
+        # Una sola normalización Unicode compartida por spaCy y el conteo
+        # de tokens (spaCy recibe el texto sin casefold para no perder las
+        # mayúsculas que usa el tagger)
+        texto_nfkc = _nfkc(texto)
+        if _es_trivial(texto_nfkc):
+            return self._construir_resultado(texto, texto_nfkc, None, top_n, top_phrases, vacio=True)
+
+        # Sustantivos, verbos y frases clave (usar spaCy si está disponible)
+        doc = None
+        if self.nlp:
+            try:
+                with self.nlp.select_pipes(disable=self._pipes_innecesarios(top_phrases)):
+                    doc = self.nlp(texto_nfkc)
+            except Exception as e:
+                logger.error(f'Error procesando con spaCy: {e}')
+                # Dejar listas vacías o caer al fallback
+        return self._construir_resultado(texto, texto_nfkc, doc, top_n, top_phrases)
+
+    def batch(self, textos, top_n=5, top_phrases=6, batch_size=64, n_process=1):
+        """Equivale a `extraer_palabras_clave_batch(textos, self.nlp, ...)`."""
+        resultados = [None] * len(textos)
+        validos = [(i, t, _nfkc(t)) for i, t in enumerate(textos) if t and isinstance(t, str) and t.strip()]
+        if not validos:
+            return resultados
+
+        # Los textos triviales no pasan por spaCy
+        for i, texto, texto_nfkc in validos:
+            if _es_trivial(texto_nfkc):
+                resultados[i] = self._construir_resultado(texto, texto_nfkc, None, top_n, top_phrases, vacio=True)
+        validos = [v for v in validos if resultados[v[0]] is None]
+
+        docs = [None] * len(validos)
+        if self.nlp and validos:
+            try:
+                with self.nlp.select_pipes(disable=self._pipes_innecesarios(top_phrases)):
+                    docs = list(self.nlp.pipe((t for _, _, t in validos), batch_size=batch_size, n_process=n_process))
+            except Exception as e:
+                logger.error(f'Error procesando con spaCy: {e}')
+
+        for (i, texto, texto_nfkc), doc in zip(validos, docs):
+            resultados[i] = self._construir_resultado(texto, texto_nfkc, doc, top_n, top_phrases)
+        return resultados
+
+    def _pipes_innecesarios(self, top_phrases):
+        """
+        Componentes de spaCy que se pueden desactivar para esta llamada.
+
+        NER nunca se usa; el parser solo hace falta para `doc.noun_chunks`,
+        así que se desactiva cuando no se piden frases clave
+        (`top_phrases <= 0`). Solo se devuelven los componentes activos.
+        """
+        sobrantes = ('ner',) if top_phrases > 0 else ('ner', 'parser')
+        return [p for p in sobrantes if p in self.nlp.pipe_names]
+
+    @staticmethod
+    def _construir_resultado(texto, texto_nfkc, doc, top_n, top_phrases, vacio=False):
+        # Tokens y conteo (NLTK o fallback simple)
+        top_5 = [] if vacio else _contar_tokens(texto_nfkc.casefold(), top_n)
+
+        sustantivos_relevantes, verbos_principales, frases_clave = [], [], []
+        if doc is not None:
+            sustantivos_relevantes, verbos_principales, frases_clave = _analizar_doc(doc, top_n, top_phrases)
+
+        resultado = {
+            'top_5_palabras': top_5,
+            'sustantivos': sustantivos_relevantes,
+            'verbos': verbos_principales,
+            'frases_clave': frases_clave,
+        }
+
+        # Registrar resultado (el logger ya recorta el snippet del texto)
+        logger.log('Extracción de Palabras Clave (mejorada)', texto, resultado)
+
+        return resultado
+
+
+# Última instancia usada por las funciones libres; se reutiliza mientras
+# se llame con el mismo objeto `nlp`
+_extractor = None
+
+
+def _get_extractor(nlp):
+    """Devuelve un `KeywordExtractor` para `nlp`, reutilizando el anterior si coincide."""
+    global _extractor
+    if _extractor is None or _extractor.nlp is not nlp:
+        _extractor = KeywordExtractor(nlp)
+    return _extractor
 
 
 def extraer_palabras_clave(texto: str, nlp=None, top_n=5, top_phrases=6):
@@ -183,15 +458,18 @@ def extraer_palabras_clave(texto: str, nlp=None, top_n=5, top_phrases=6):
 
     Proceso (paso a paso):
         1. Validación: si `texto` no es `str` o está vacío, devuelve `None`.
-        2. Normalización: aplica `_normalize_text` para normalizar Unicode
-           y casefold.
+           Si tiene menos de 4 caracteres o ninguna letra, devuelve un
+           resultado con todas las listas vacías sin ejecutar NLTK ni spaCy.
+        2. Normalización: aplica `_nfkc` una sola vez; el conteo de tokens
+           usa ese texto con `casefold()` y spaCy lo recibe sin casefold.
         3. Tokenización y conteo de tokens:
            - Si NLTK está disponible, se usa `word_tokenize` y el conjunto
              de `stopwords` cacheado (`_stopwords_es`).
            - Si NLTK no está disponible, se aplica una expresión regular
              Unicode para tokenizar palabras básicas.
         4. Extracción morfosintáctica (opcional):
-           - Si se proporciona `nlp` (spaCy), se procesa `doc = nlp(texto)`.
+           - Si se proporciona `nlp` (spaCy), se procesa el texto normalizado
+             a NFKC (sin casefold) con `doc = nlp(texto)`.
            - Se extraen sustantivos y verbos mediante `token.pos_` y
              se cuentan por lema (`token.lemma_`) para agrupar formas.
         5. Frases clave (noun-chunks):
@@ -209,7 +487,8 @@ def extraer_palabras_clave(texto: str, nlp=None, top_n=5, top_phrases=6):
             `None`, la función hará un fallback y no generará `frases_clave`.
         top_n (int): número de elementos a devolver en las listas de palabras,
             sustantivos y verbos.
-        top_phrases (int): número máximo de frases clave a devolver.
+        top_phrases (int): número máximo de frases clave a devolver. Con
+            `0` no se calculan frases y se desactiva el parser de spaCy.
 
     Returns:
         dict | None: Diccionario con las claves:
@@ -238,88 +517,40 @@ def extraer_palabras_clave(texto: str, nlp=None, top_n=5, top_phrases=6):
             'frases_clave': [('procesamiento del lenguaje natural', 3.6), ...]
         }
     """
-    if not texto or not isinstance(texto, str) or not texto.strip():
-        return None
+    return _get_extractor(nlp)(texto, top_n=top_n, top_phrases=top_phrases)
 
-    texto_norm = _normalize_text(texto)
 
-    # ------------------
-    # Tokens y conteo (NLTK o fallback simple)
-    # ------------------
-    tokens_filtered = []
-    if nltk and word_tokenize:
-        tokens = word_tokenize(texto_norm)
-        stopwords_es = _stopwords_es
-        tokens_filtered = [t for t in tokens if re.fullmatch(r"[\w\-áéíóúñü]+", t, flags=re.UNICODE) and t not in stopwords_es and len(t) > 2]
-        top_5 = Counter(tokens_filtered).most_common(top_n)
-    else:
-        # Fallback: tokenizar por palabra simple
-        tokens = re.findall(r"[\w\-áéíóúñü]+", texto_norm, flags=re.UNICODE)
-        tokens_filtered = [t for t in tokens if t not in _stopwords_es and len(t) > 2]
-        top_5 = Counter(tokens_filtered).most_common(top_n)
-
-    # ------------------
-    # Sustantivos y verbos (usar spaCy si está disponible)
-    # ------------------
-    sustantivos_relevantes = []
-    verbos_principales = []
-    doc = None
-    if nlp:
-        try:
-            doc = nlp(texto)
-            # Usar lemas para agrupar formas flexionadas
-            sustantivos_relevantes = Counter([token.lemma_.casefold() for token in doc if token.pos_ == 'NOUN' and len(token.lemma_) > 2]).most_common(top_n)
-            verbos_principales = Counter([token.lemma_.casefold() for token in doc if token.pos_ == 'VERB' and len(token.lemma_) > 2]).most_common(top_n)
-        except Exception as e:
-            logger.error(f'Error procesando con spaCy: {e}')
-            # Dejar listas vacías o caer al fallback
-
-    # ------------------
-    # Frases clave (noun-chunks) con puntuación simple
-    # ------------------
-    frases_clave = []
-    if nlp and doc is not None:
-        # Contar ocurrencias de noun_chunks (normalizados)
-        phrase_counter = Counter()
-        for chunk in doc.noun_chunks:
-            # Normalizar y limpiar los bordes
-            words = [t for t in chunk if not t.is_stop and t.is_alpha]
-            if not words:
-                continue
-            # Construir una versión canónica basada en lemas
-            phrase_lemmas = ' '.join([t.lemma_.casefold() for t in words])
-            if len(phrase_lemmas) < 3:
-                continue
-            phrase_counter[phrase_lemmas] += 1
-
-        # Preparar lista y aplicar puntuación que prioriza frases multi-palabra
-        sustantivos_top = {s for s, _ in sustantivos_relevantes}
-        scored_phrases = []
-        for phrase, freq in phrase_counter.items():
-            num_words = len(phrase.split())
-            contains_top_noun = 1 if any(word in sustantivos_top for word in phrase.split()) else 0
-            # Fórmula simple: frecuencia * (1 + 0.5 * (num_words - 1)) + 0.2 * contains_top_noun
-            score = freq * (1 + 0.5 * (num_words - 1)) + 0.2 * contains_top_noun
-            scored_phrases.append((phrase, round(score, 3)))
-
-        frases_clave = sorted(scored_phrases, key=lambda x: x[1], reverse=True)[:top_phrases]
-
-    resultado = {
-        'top_5_palabras': top_5,
-        'sustantivos': sustantivos_relevantes,
-        'verbos': verbos_principales,
-        'frases_clave': frases_clave,
-    }
-
-    # Registrar resultado (se registra un snippet del texto dentro del logger)
-    logger.log('Extracción de Palabras Clave (mejorada)', texto[:120], resultado)
-
-    return resultado
+def extraer_palabras_clave_batch(textos, nlp=None, top_n=5, top_phrases=6, batch_size=64, n_process=1):
+    """
+    Versión por lotes de `extraer_palabras_clave` para listas de textos.
+
+    Los textos válidos se procesan con `nlp.pipe`, que agrupa los documentos
+    y evita el coste fijo de llamar a `nlp(texto)` uno a uno. Cada `Doc`
+    se analiza una sola vez con `_analizar_doc`.
+
+    Args:
+        textos (list[str]): Textos de entrada.
+        nlp (Optional[Language]): objeto spaCy; si es `None` solo se
+            calculan las `top_5_palabras`.
+        top_n (int): igual que en `extraer_palabras_clave`.
+        top_phrases (int): igual que en `extraer_palabras_clave`.
+        batch_size (int): número de textos por lote en `nlp.pipe`.
+        n_process (int): procesos usados por `nlp.pipe` (`-1` = todos los
+            núcleos; útil solo en corpus grandes).
+
+    Returns:
+        list[dict | None]: un resultado por texto, en el mismo orden; `None`
+        para las entradas no válidas.
+    """
+    return _get_extractor(nlp).batch(textos, top_n=top_n, top_phrases=top_phrases,
+                                     batch_size=batch_size, n_process=n_process)
 
 
 # ----------------------
 # Función auxiliar para mostrar resultados en consola
 # ----------------------
+_CABECERA_RESULTADOS = '\n' + '=' * 60 + '\nRESULTADOS DE EXTRACCIÓN (MEJORADO)\n' + '=' * 60 + '\n'
+
 def mostrar_resultados(palabras_clave):
     """
     Muestra los resultados de la extracción de palabras clave en consola.
@@ -344,30 +575,24 @@ def mostrar_resultados(palabras_clave):
         print('No hay resultados para mostrar.')
         return
 
-    print('\n' + '=' * 60)
-    print('RESULTADOS DE EXTRACCIÓN (MEJORADO)')
-    print('=' * 60)
-
-    print('\nTOP PALABRAS:')
-    for i, (palabra, freq) in enumerate(palabras_clave['top_5_palabras'], 1):
-        print(f'  {i}. {palabra}: {freq} veces')
-
-    print('\nSUSTANTIVOS:')
-    for i, (sustantivo, freq) in enumerate(palabras_clave['sustantivos'], 1):
-        print(f'  {i}. {sustantivo}: {freq} veces')
-
-    print('\nVERBOS:')
-    for i, (verbo, freq) in enumerate(palabras_clave['verbos'], 1):
-        print(f'  {i}. {verbo}: {freq} veces')
-
-    print('\nFRASES CLAVE:')
+    # Se compone toda la salida y se escribe de una vez
+    partes = [_CABECERA_RESULTADOS, '\nTOP PALABRAS:\n']
+    partes.extend(f'  {i}. {palabra}: {freq} veces\n'
+                  for i, (palabra, freq) in enumerate(palabras_clave['top_5_palabras'], 1))
+    partes.append('\nSUSTANTIVOS:\n')
+    partes.extend(f'  {i}. {sustantivo}: {freq} veces\n'
+                  for i, (sustantivo, freq) in enumerate(palabras_clave['sustantivos'], 1))
+    partes.append('\nVERBOS:\n')
+    partes.extend(f'  {i}. {verbo}: {freq} veces\n'
+                  for i, (verbo, freq) in enumerate(palabras_clave['verbos'], 1))
+    partes.append('\nFRASES CLAVE:\n')
     if palabras_clave['frases_clave']:
-        for i, (frase, score) in enumerate(palabras_clave['frases_clave'], 1):
-            print(f'  {i}. {frase}: score={score}')
+        partes.extend(f'  {i}. {frase}: score={score}\n'
+                      for i, (frase, score) in enumerate(palabras_clave['frases_clave'], 1))
     else:
-        print('  (spaCy no disponible o no se encontraron frases)')
-
-    print('\n' + '=' * 60 + '\n')
+        partes.append('  (spaCy no disponible o no se encontraron frases)\n')
+    partes.append('\n' + '=' * 60 + '\n\n')
+    sys.stdout.write(''.join(partes))
 
 
 # ----------------------
@@ -384,7 +609,7 @@ if __name__ == '__main__':
     print('Demostración del módulo "bloque_mejoras"')
     print('Logs -->', logger.filename)
 
-    resultado = extraer_palabras_clave(sample_text, nlp=_nlp)
+    resultado = extraer_palabras_clave(sample_text, nlp=_get_nlp())
     mostrar_resultados(resultado)
 
     print('Demo finalizada.')
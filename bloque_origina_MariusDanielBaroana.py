@@ -12,10 +12,11 @@ Además, registra los resultados de cada extracción en un archivo de log estruc
 # ----------------------
 # IMPORTACIONES
 # ----------------------
-import os
-from datetime import datetime
 from collections import Counter
 
+# Logger de sesión compartido con wordChef
+from wordChef import logger
+
 try:
     import spacy
 except ImportError:
@@ -41,6 +42,9 @@ except LookupError:
     nltk.download('punkt')
     nltk.download('stopwords')
 
+# Stopwords en español cargadas una sola vez (no en cada extracción)
+STOPWORDS_ES = frozenset(stopwords.words('spanish'))
+
 # ----------------------
 # CARGA DEL MODELO DE SPACY
 # ----------------------
@@ -51,71 +55,6 @@ except OSError:
     print("Por favor ejecuta: python -m spacy download es_core_news_sm")
     exit()
 
-# ----------------------
-# CLASS: SessionLogger
-# ----------------------
-class SessionLogger:
-    """
-    Logger de sesión para guardar los resultados de los análisis en un archivo.
-
-    Cada vez que se crea una instancia de esta clase se genera un archivo
-    nuevo en la carpeta `logs/` con nombre `session_YYYYMMDD_HHMMSS.log`.
-
-    Métodos principales:
-    - log(tipo, entrada, resultado): guarda un análisis genérico.
-    - registrar_patron(tipo_patron, coincidencias): guarda búsquedas por patrón.
-
-    El logger mantiene el archivo legible para un humano, con encabezados,
-    timestamps y presentación en viñetas para listas.
-    Está pensado para seguimiento de sesiones interactivas desde el CLI.
-    """
-
-    def __init__(self):
-        """Crea carpeta logs si no existe y genera el archivo de log con timestamp."""
-        if not os.path.exists("logs"):
-            os.makedirs("logs")
-            print("📁 Carpeta 'logs' creada automáticamente.")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.filename = f"logs/session_{timestamp}.log"
-        self._write_header()
-
-    def _write_header(self):
-        """Escribe cabecera inicial del log con formato y fecha actual."""
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"  SESIÓN de Extracción de Palabras Clave - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-
-    def log(self, tipo: str, entrada: str, resultado):
-        """
-        Añade una entrada al log con tipo, fragmento de entrada y resultado.
-
-        Args:
-            tipo (str): Tipo de acción registrada (e.g., “Extracción de palabras”)
-            entrada (str): Texto procesado
-            resultado: Resultado del análisis (dict o str)
-        """
-        with open(self.filename, 'a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] {tipo}\n")
-            f.write("-" * 80 + "\n")
-            entrada_truncada = entrada[:100] + ('...' if len(entrada) > 100 else '')
-            f.write(f"Entrada: {entrada_truncada}\n\n")
-            if isinstance(resultado, dict):
-                for clave, valor in resultado.items():
-                    f.write(f"  {clave}:\n")
-                    if isinstance(valor, (list, set)):
-                        for item in valor:
-                            f.write(f"    • {item}\n")
-                    else:
-                        f.write(f"   {valor}\n")
-            else:
-                f.write(f"Resultado: {resultado}\n")
-            f.write("\n" + "=" * 80 + "\n\n")
-
-
-logger = SessionLogger()
-print(f"📝 Sesión iniciada. Logs guardados en: {logger.filename}\n")
-
 # ----------------------
 # FUNCIÓN: extraer_palabras_clave
 # ----------------------
@@ -152,8 +91,7 @@ def extraer_palabras_clave(texto, nlp=None):
     # Extracción de top palabras con NLTK
     if nltk:
         tokens = word_tokenize(texto.lower())
-        stopwords_es = set(stopwords.words('spanish'))
-        tokens_filtrados = [t for t in tokens if t.isalnum() and t not in stopwords_es and len(t) > 2]
+        tokens_filtrados = [t for t in tokens if t.isalnum() and t not in STOPWORDS_ES and len(t) > 2]
         top_5 = Counter(tokens_filtrados).most_common(5)
     else:
         top_5 = []
@@ -0,0 +1,28 @@
+"""
+Pruebas de regresión de `corregir_palabras` y `normalizador_texto` (sin spaCy)
+"""
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.dirname(__file__))
+
+from wordChef import corregir_palabras, normalizador_texto
+
+
+class TestCorregirPalabras(unittest.TestCase):
+    def test_corrige_y_quita_repeticiones(self):
+        self.assertEqual(corregir_palabras("no haiga naiden en la la casa"),
+                         "no haya nadie en la casa")
+
+    def test_formas_que_solo_casan_con_ignorecase(self):
+        # "İVA".lower() == "i̇va" y "caſa".lower() == "caſa": no son claves
+        self.assertEqual(corregir_palabras("İVA incluido"), "İVA incluido")
+        self.assertEqual(corregir_palabras("caſa bonita"), "caſa bonita")
+
+    def test_normalizador_sin_spacy(self):
+        res = normalizador_texto("İVA incluido", None)
+        self.assertEqual(res["corregido"], "İVA incluido")
+
+
+if __name__ == "__main__":
+    unittest.main()
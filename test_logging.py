@@ -5,15 +5,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from wordChef import logger, encontrar_fechas, encontrar_dinero, encontrar_correos
+from wordChef import logger, encontrar_todo
 
 # Test logging
 texto_prueba = "Nací el 15/03/1995 y mi email es juan@ejemplo.com. Gané 1500€."
 
 # Test pattern finding with logging
-fechas = encontrar_fechas(texto_prueba)
-dinero = encontrar_dinero(texto_prueba)
-correos = encontrar_correos(texto_prueba)
+fechas, dinero, correos = encontrar_todo(texto_prueba)
 
 logger.registrar_patron("Fechas", fechas)
 logger.registrar_patron("Dinero", dinero)
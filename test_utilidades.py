@@ -0,0 +1,60 @@
+"""
+Pruebas de las utilidades sin dependencias de wordChef: trozos para el
+sentimiento, selección de oraciones del resumen y búsqueda de patrones
+"""
+import sys
+import os
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.dirname(__file__))
+
+import wordChef
+from wordChef import (_trozos_sentimiento, _mejores_indices, encontrar_todo,
+                      encontrar_fechas, encontrar_dinero, encontrar_correos)
+
+
+class TestTrozosSentimiento(unittest.TestCase):
+    def test_agrupa_oraciones_consecutivas(self):
+        self.assertEqual(_trozos_sentimiento(["ab", "cd", "ef"], 5), ["ab cd", "ef"])
+
+    def test_oracion_larga_no_mezcla_lo_pendiente(self):
+        self.assertEqual(_trozos_sentimiento(["x", "aaaa bbbb", "y"], 3),
+                         ["x", "aaa", "a", "bbb", "b y"])
+
+    def test_corte_sin_espacios_sobrantes(self):
+        self.assertEqual(_trozos_sentimiento(["ab   cdefgh"], 4), ["ab", "cdef", "gh"])
+
+    def test_ningun_trozo_supera_el_maximo(self):
+        oraciones = ["palabra " * 40, "corta.", "otra " * 25 + "final."]
+        trozos = _trozos_sentimiento(oraciones, 30)
+        self.assertTrue(all(0 < len(t) <= 30 for t in trozos))
+        self.assertEqual(" ".join(trozos).split(), " ".join(oraciones).split())
+
+
+class TestMejoresIndices(unittest.TestCase):
+    def test_orden_de_aparicion_y_empates(self):
+        self.assertEqual(_mejores_indices([1, 5, 3, 5, 0], 2), [1, 3])
+        self.assertEqual(_mejores_indices([2, 2, 2, 2], 2), [0, 1])
+        self.assertEqual(_mejores_indices([1, 2], 0), [])
+
+    def test_mismo_resultado_con_y_sin_numpy(self):
+        puntuaciones = [(i * 7919) % 13 for i in range(wordChef._UMBRAL_NUMPY + 50)]
+        esperado = sorted(sorted(range(len(puntuaciones)),
+                                 key=lambda i: (-puntuaciones[i], i))[:10])
+        self.assertEqual(_mejores_indices(puntuaciones, 10), esperado)
+        with mock.patch.object(wordChef, "_UMBRAL_NUMPY", 10 ** 9):
+            self.assertEqual(_mejores_indices(puntuaciones, 10), esperado)
+
+
+class TestEncontrarTodo(unittest.TestCase):
+    def test_coincide_con_las_busquedas_separadas(self):
+        texto = "El 12/03/2024 pagué 1.200,50 € a ana@ejemplo.com y el 2024-01-05 otros 30 euros."
+        self.assertEqual(encontrar_todo(texto),
+                         (encontrar_fechas(texto), encontrar_dinero(texto), encontrar_correos(texto)))
+
+    def test_sin_coincidencias(self):
+        self.assertEqual(encontrar_todo("nada que buscar"), ([], [], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
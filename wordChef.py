@@ -13,6 +13,14 @@ Unifica utilidades de procesamiento de texto con:
 import re
 import sys
 import os
+import functools
+import importlib
+import atexit
+import heapq
+import mmap
+import queue
+import threading
+import time
 from collections import Counter
 from datetime import datetime
 
@@ -20,36 +28,45 @@ from datetime import datetime
 # ----------------------
 # Intentos de import
 # ----------------------
-# Trata de importar spaCy; si no está, asigna None para manejo posterior
-try:
-    import spacy
-except ImportError:
-    spacy = None
-
-# Trata de importar nltk y módulos necesarios; si no está, asigna None
-try:
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-except ImportError:
-    nltk = None
-
-# Trata de importar pipeline desde transformers; si no está, asigna None
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
+# spaCy, nltk, transformers y numpy tardan en importarse (transformers
+# arrastra torch), así que no se importan al cargar el módulo sino la
+# primera vez que se usan, con `_importar`; la GUI abre sin esperarlos.
+# Devuelve el módulo o None si no está instalado (se recuerda el resultado)
+@functools.lru_cache(maxsize=None)
+def _importar(nombre):
+    try:
+        return importlib.import_module(nombre)
+    except ImportError:
+        return None
 
 
 # ----------------------
 # Logging de sesión - Marius
 # ----------------------
+# Separadores del log, construidos una sola vez
+SEP_EQ = "="*80 + "\n"
+SEP_DASH = "-"*80 + "\n"
+SEP_FIN = "\n" + SEP_EQ + "\n"
+
+# Último segundo formateado como HH:MM:SS, para no volver a formatear la
+# hora en cada entrada del log dentro del mismo segundo
+_ultima_hora = [-1, ""]
+
+
+def _hora_actual():
+    t = int(time.time())
+    if t != _ultima_hora[0]:
+        lt = time.localtime(t)
+        _ultima_hora[:] = [t, f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"]
+    return _ultima_hora[1]
+
 class SessionLogger:
     """
     Logger de sesión para guardar los resultados de los análisis en un archivo.
 
-    Cada vez que se crea una instancia de esta clase se genera un archivo
-    nuevo en la carpeta `logs/` con nombre `session_YYYYMMDD_HHMMSS.log`.
+    Cada instancia escribe en un archivo nuevo de la carpeta `logs/` con
+    nombre `session_YYYYMMDD_HHMMSS.log`, que se crea con la primera entrada
+    registrada (si la sesión no registra nada, no se crea ningún archivo).
 
     Métodos principales:
     - log(tipo, entrada, resultado): guarda un análisis genérico.
@@ -58,58 +75,166 @@ class SessionLogger:
     El logger mantiene el archivo legible para un humano, con encabezados,
     timestamps y presentación en viñetas para listas. Está pensado para
     seguimiento de sesiones interactivas desde el CLI.
+
+    El archivo se abre una sola vez con un búfer de 128 KiB y se vuelca a
+    disco al salir del programa o al llamar a `flush()`, en vez de abrirlo
+    y cerrarlo en cada entrada. Las entradas se formatean en el hilo que
+    llama y se encolan; un hilo escritor en segundo plano las agrupa y las
+    escribe, así la interfaz no espera al disco.
     """
-    # Constructor crea carpeta logs si no existe y crea fichero log con timestamp
+    # Constructor: solo fija el nombre del fichero; se crea al primer registro
     def __init__(self):
-        if not os.path.exists("logs"):
-            os.makedirs("logs")
-            print("📁 Carpeta 'logs' creada automáticamente.")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.filename = f"logs/session_{timestamp}.log"
-        self._write_header()
+        self._fh = None
+        self._q = None
+        self._writer = None
+        self._lock = threading.Lock()
+
+    # Crea carpeta logs (si falta), abre el fichero y arranca el hilo escritor
+    def _abrir(self):
+        with self._lock:
+            if self._q is not None:
+                return
+            os.makedirs("logs", exist_ok=True)
+            # backslashreplace: un texto no codificable (p. ej. surrogates
+            # sueltos pegados en la GUI) se escribe escapado en vez de fallar
+            self._fh = open(self.filename, 'w', encoding='utf-8', errors='backslashreplace',
+                            buffering=1 << 17)
+            self._write_header()
+            q = queue.Queue()
+            self._writer = threading.Thread(target=self._drain, args=(q,), name="wordChef-log", daemon=True)
+            self._writer.start()
+            self._q = q
+            atexit.register(self.close)
+            print(f"📝 Sesión iniciada. Logs guardados en: {self.filename}\n")
+
+    # Encola una entrada ya formateada, abriendo el log si es la primera
+    def _put(self, texto):
+        if self._q is None:
+            self._abrir()
+        self._q.put(texto)
 
     # Escribe cabecera inicial del log con formato y fecha
     def _write_header(self):
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write(f"  SESIÓN wordChef - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*80 + "\n\n")
+        self._fh.write(f"{SEP_EQ}  SESIÓN wordChef - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n{SEP_EQ}\n")
+
+    # Registra el resultado de una búsqueda por patrón (fechas, dinero, correos...)
+    def registrar_patron(self, tipo_patron: str, coincidencias):
+        parts = [f"[{_hora_actual()}] Patrón: {tipo_patron}\n", SEP_DASH]
+        if coincidencias:
+            parts.extend(f"    • {item}\n" for item in coincidencias)
+        else:
+            parts.append("    (sin coincidencias)\n")
+        parts.append(SEP_FIN)
+        self._put("".join(parts))
+
+    # Hilo escritor: agrupa lo que haya en la cola y lo escribe de una vez.
+    # La cola lleva textos, marcas de `flush()` (threading.Event, se activan
+    # tras escribir lo encolado antes que ellas) y None para terminar.
+    # Un error al escribir se avisa por stderr pero no detiene el hilo, y las
+    # marcas se activan igualmente para que `flush()` no se bloquee
+    def _drain(self, q):
+        while True:
+            batch = [q.get()]
+            while True:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            fin = None in batch
+            try:
+                self._fh.write("".join(b for b in batch if isinstance(b, str)))
+            except Exception as e:
+                print(f"Error al escribir el log: {e}", file=sys.stderr)
+            finally:
+                for b in batch:
+                    if isinstance(b, threading.Event):
+                        b.set()
+            if fin:
+                return
+
+    # Espera a que se escriban las entradas encoladas y las vuelca a disco.
+    # Con `timeout` (segundos) no espera más de eso; tampoco espera si el hilo
+    # escritor ya no está vivo. Devuelve True si se escribió todo lo encolado
+    def flush(self, timeout=None):
+        if self._q is None:
+            return True
+        if self._writer.is_alive():
+            escrito = threading.Event()
+            self._q.put(escrito)
+            hecho = escrito.wait(timeout)
+        else:
+            hecho = self._q.empty()
+        if not self._fh.closed:
+            self._fh.flush()
+        return hecho
+
+    # Detiene el hilo escritor (tras vaciar la cola) y cierra el archivo
+    def close(self):
+        if self._q is None or self._fh.closed:
+            return
+        self._q.put(None)
+        self._writer.join()
+        self._fh.close()
 
     # Añade entrada de log con tipo, fragmento de entrada y resultado
     def log(self, tipo: str, entrada: str, resultado):
-        with open(self.filename, 'a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] {tipo}\n")
-            f.write("-"*80 + "\n")
-            entrada_truncada = entrada[:100] + ('...' if len(entrada) > 100 else '')
-            f.write(f"Entrada: {entrada_truncada}\n\n")
-            if isinstance(resultado, dict):
-                for clave, valor in resultado.items():
-                    f.write(f"  {clave}:\n")
-                    if isinstance(valor, (list, set)):
-                        for item in valor:
-                            f.write(f"    • {item}\n")
-                    else:
-                        f.write(f"   {valor}\n")
-            else:
-                f.write(f"Resultado: {resultado}\n")
-            f.write("\n" + "="*80 + "\n\n")
-
+        entrada_truncada = entrada[:100] + ('...' if len(entrada) > 100 else '')
+        parts = [f"[{_hora_actual()}] {tipo}\n", SEP_DASH, f"Entrada: {entrada_truncada}\n\n"]
+        if isinstance(resultado, dict):
+            for clave, valor in resultado.items():
+                parts.append(f"  {clave}:\n")
+                if isinstance(valor, (list, set)):
+                    parts.extend(f"    • {item}\n" for item in valor)
+                else:
+                    parts.append(f"   {valor}\n")
+        else:
+            parts.append(f"Resultado: {resultado}\n")
+        parts.append(SEP_FIN)
+        self._put("".join(parts))
 
+# Instancia compartida: el fichero no se crea hasta el primer registro,
+# así importar el módulo (GUI, pruebas) no deja logs vacíos
 logger = SessionLogger()
-print(f"📝 Sesión iniciada. Logs guardados en: {logger.filename}\n")
 
 
 # ----------------------
 # Entrada de texto
 # ----------------------
-# Función para leer texto desde un archivo; devuelve el contenido o None si error
+# Archivos a partir de este tamaño se leen con mmap en vez de os.read
+_UMBRAL_MMAP = 16 * 1024 * 1024
+
+
+# Función para leer texto desde un archivo; devuelve el contenido o None si error.
+# Lee los bytes de una vez (o con mmap si es grande) y decodifica una sola vez,
+# sin pasar por el decodificador incremental de TextIOWrapper
 def leer_archivo(ruta: str) -> str | None:
-    if not os.path.exists(ruta):
+    try:
+        fd = os.open(ruta, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            tam = os.fstat(fd).st_size
+            if tam >= _UMBRAL_MMAP:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as m:
+                    datos = m[:]
+            else:
+                trozos = []
+                while True:
+                    trozo = os.read(fd, max(tam, 1 << 16))
+                    if not trozo:
+                        break
+                    trozos.append(trozo)
+                datos = b"".join(trozos)
+        finally:
+            os.close(fd)
+        texto = datos.decode('utf-8')
+        # Mismos saltos de línea que el modo texto de open()
+        if '\r' in texto:
+            texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+        return texto
+    except FileNotFoundError:
         print(f"Error: El archivo '{ruta}' no existe.")
         return None
-    try:
-        with open(ruta, 'r', encoding='utf-8') as f:
-            return f.read()
     except Exception as e:
         print(f"Error al leer el archivo: {e}")
         return None
@@ -127,6 +252,11 @@ def cargar_modelo_spacy():
     2. `es_core_news_md`
     3. `xx_sent_ud_sm`
 
+    El `parser` se excluye al cargar: ningún análisis usa dependencias y
+    las oraciones las delimita el `sentencizer` que se añade al pipeline.
+    El resto de componentes que una tarea no necesita se desactivan por
+    llamada en `procesar_spacy`.
+
     Si ninguno está disponible, crea un pipeline vacío para español (`spacy.blank("es")`)
     e intenta añadir un `sentencizer` para segmentación en oraciones.
 
@@ -134,6 +264,7 @@ def cargar_modelo_spacy():
         nlp (spacy.lang): Objeto de procesamiento lingüístico de spaCy.
         Si spaCy no está instalado, retorna `None`.
     """
+    spacy = _importar("spacy")
     if spacy is None:
         print("Aviso: spaCy no instalado. Algunas funciones no estarán disponibles.")
         return None
@@ -142,12 +273,15 @@ def cargar_modelo_spacy():
 
     for m in modelos:
         try:
-            nlp = spacy.load(m)
+            # El parser solo aportaría la segmentación en oraciones, que ya
+            # hace el sentencizer; se excluye para no cargarlo ni ejecutarlo
+            nlp = spacy.load(m, exclude=["parser"])
             if "sentencizer" not in nlp.pipe_names:
                 try:
                     nlp.add_pipe("sentencizer")
                 except Exception:
-                    pass
+                    # Sin sentencizer hace falta el parser para `doc.sents`
+                    nlp = spacy.load(m)
             return nlp
         except Exception:
             continue
@@ -161,6 +295,42 @@ def cargar_modelo_spacy():
     return nlp
 
 
+# Componentes de spaCy que cada análisis no usa y puede desactivar
+_PIPES_SOBRANTES = {
+    "normalizador": ("parser", "ner"),
+    "ner": ("parser", "lemmatizer"),
+    "palabras_clave": ("parser", "ner", "lemmatizer"),
+    "resumen": ("parser", "ner", "lemmatizer"),
+}
+
+
+def procesar_spacy(nlp, texto, tarea, doc=None):
+    """
+    Procesa `texto` con spaCy desactivando los componentes que `tarea` no usa.
+
+    Solo se desactivan componentes presentes en el pipeline. En "resumen"
+    el parser se mantiene si no hay `sentencizer`, porque es el que
+    delimita las oraciones.
+
+    Args:
+        nlp: Pipeline spaCy.
+        texto (str): Texto a procesar.
+        tarea (str): Clave de `_PIPES_SOBRANTES`.
+        doc (Doc, opcional): Documento ya procesado con el pipeline completo
+            (p. ej. el que guarda la GUI); si se da, se devuelve tal cual.
+
+    Returns:
+        Doc: Documento spaCy procesado.
+    """
+    if doc is not None:
+        return doc
+    sobrantes = [p for p in _PIPES_SOBRANTES[tarea] if p in nlp.pipe_names]
+    if tarea == "resumen" and "sentencizer" not in nlp.pipe_names and "parser" in sobrantes:
+        sobrantes.remove("parser")
+    with nlp.select_pipes(disable=sobrantes):
+        return nlp(texto)
+
+
 def inicializar_nltk():
     """
     Inicializa recursos necesarios de NLTK.
@@ -176,6 +346,7 @@ def inicializar_nltk():
     Returns:
         None
     """
+    nltk = _importar("nltk")
     if nltk is not None:
         try:
             nltk.data.find('tokenizers/punkt')
@@ -185,28 +356,89 @@ def inicializar_nltk():
             nltk.download('stopwords')
 
 
+# Modelos de sentimiento, en orden de preferencia: BETO (español, 3 clases
+# NEG/NEU/POS, más ligero) y, como respaldo, nlptown (multilingüe, 5 clases
+# "1 star" ... "5 stars"). `_etiqueta_a_sentimiento` entiende ambos
+MODELOS_SENTIMIENTO = (
+    "finiteautomata/beto-sentiment-analysis",
+    "nlptown/bert-base-multilingual-uncased-sentiment",
+)
+
+
+def _cargar_sentimiento_int8(transformers, modelo_id):
+    """
+    Carga un modelo de sentimiento cuantizado a int8 con ONNX Runtime.
+
+    La primera vez exporta `modelo_id` a ONNX y lo cuantiza de forma
+    dinámica (pesos int8) con Optimum en `models/<nombre>-int8/`; las
+    siguientes veces carga directamente esa copia.
+
+    Returns:
+        pipeline or None: `None` si Optimum no está instalado o falla la conversión.
+    """
+    if _importar("optimum.onnxruntime") is None:
+        return None
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    directorio = os.path.join("models", modelo_id.rsplit("/", 1)[-1] + "-int8")
+    try:
+        cuantizado = os.path.join(directorio, "model_quantized.onnx")
+        if not os.path.exists(cuantizado):
+            modelo = ORTModelForSequenceClassification.from_pretrained(modelo_id, export=True)
+            modelo.save_pretrained(directorio)
+            transformers.AutoTokenizer.from_pretrained(modelo_id).save_pretrained(directorio)
+            config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            ORTQuantizer.from_pretrained(modelo).quantize(save_dir=directorio, quantization_config=config)
+        modelo = ORTModelForSequenceClassification.from_pretrained(directorio, file_name="model_quantized.onnx")
+        tokenizer = transformers.AutoTokenizer.from_pretrained(directorio)
+        return transformers.pipeline("sentiment-analysis", model=modelo, tokenizer=tokenizer)
+    except Exception:
+        return None
+
+
 def inicializar_sentimiento():
     """
     Inicializa un clasificador de sentimiento usando Transformers.
 
-    Carga el modelo `nlptown/bert-base-multilingual-uncased-sentiment`
-    a través del pipeline de HuggingFace.
+    Prueba los modelos de `MODELOS_SENTIMIENTO` en orden (BETO primero,
+    nlptown como respaldo) a través del pipeline de HuggingFace. Si hay
+    GPU CUDA disponible, el modelo se carga en ella en media precisión
+    (float16). En CPU, si Optimum (ONNX Runtime) está instalado, se usa
+    una copia cuantizada a int8 (ver `_cargar_sentimiento_int8`); si no,
+    el modelo original.
 
     Returns:
         pipeline or None:
             - Un pipeline de análisis de sentimiento si Transformers está disponible.
             - `None` si no se puede inicializar o la librería no está instalada.
     """
-    if pipeline is None:
+    transformers = _importar("transformers")
+    if transformers is None:
         return None
 
+    opciones = {}
     try:
-        return pipeline(
-            "sentiment-analysis",
-            model="nlptown/bert-base-multilingual-uncased-sentiment"
-        )
-    except Exception:
-        return None
+        import torch
+        if torch.cuda.is_available():
+            opciones = {"device": 0, "torch_dtype": torch.float16}
+    except ImportError:
+        pass
+
+    for modelo_id in MODELOS_SENTIMIENTO:
+        if not opciones:
+            clasificador = _cargar_sentimiento_int8(transformers, modelo_id)
+            if clasificador is not None:
+                return clasificador
+        try:
+            return transformers.pipeline(
+                "sentiment-analysis",
+                model=modelo_id,
+                **opciones
+            )
+        except Exception:
+            continue
+    return None
 
 # ----------------------
 # Normalización
@@ -221,42 +453,55 @@ SUSTANTIVOS_NO_NEUTROS = {
     "casa": "la casa", "persona": "la persona", "gente": "la gente",
     "niño": "el niño", "niña": "la niña", "camisa": "la camisa"
 }
-
-# Corrige palabras comunes y evita repeticiones consecutivas en un doc spaCy
-def corregir_palabras(doc):
+# Ambos diccionarios fusionados en una sola tabla de reemplazos
+assert CORRECCIONES_COMUNES.keys().isdisjoint(SUSTANTIVOS_NO_NEUTROS)
+_REEMPLAZOS = {**CORRECCIONES_COMUNES, **SUSTANTIVOS_NO_NEUTROS}
+# Cualquier palabra de la tabla, como palabra completa y sin distinguir mayúsculas
+_RE_CORRECCION = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_REEMPLAZOS, key=len, reverse=True))) + r")\b",
+    re.IGNORECASE,
+)
+
+# Palabra repetida seguida (sin distinguir mayúsculas): "la la casa" -> "la casa".
+# La sustitución se hace entera en el motor de `re`, sin recorrer tokens en Python
+_RE_DUP = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+
+# Reemplazo de una coincidencia de `_RE_CORRECCION`. Con IGNORECASE casan
+# formas como "İVA" o "caſa" cuyo .lower() no es clave de la tabla: se dejan
+# como estaban (igual que al comparar token a token)
+def _reemplazo(m):
+    palabra = m.group()
+    return _REEMPLAZOS.get(palabra.lower(), palabra)
+
+# Corrige palabras comunes y evita repeticiones consecutivas en el texto
+def corregir_palabras(texto):
     """
     Corrige errores ortográficos comunes y evita repeticiones consecutivas.
+
+    Trabaja sobre el texto original con dos sustituciones de `re`
+    (`_RE_CORRECCION` y `_RE_DUP`), así que conserva espacios y
+    puntuación y no necesita spaCy.
     
     Args:
-        doc: Documento spaCy procesado.
+        texto (str): Texto a corregir.
     
     Returns:
         str: Texto corregido y sin repeticiones.
     """
-    if doc is None:
+    if not texto:
         return ""
-    corregido = []
-    for i, token in enumerate(doc):
-        palabra = token.text.lower()
-        if palabra in CORRECCIONES_COMUNES:
-            corregido.append(CORRECCIONES_COMUNES[palabra])
-            continue
-        if palabra in SUSTANTIVOS_NO_NEUTROS:
-            corregido.append(SUSTANTIVOS_NO_NEUTROS[palabra])
-            continue
-        if i > 0 and palabra == doc[i-1].text.lower():
-            continue
-        corregido.append(token.text)
-    return " ".join(corregido)
+    corregido = _RE_CORRECCION.sub(_reemplazo, texto)
+    return _RE_DUP.sub(r"\1", corregido)
 
 # Normaliza el texto: lematiza, elimina repeticiones, corrige palabras, usando spaCy si está
-def normalizador_texto(texto, nlp):
+def normalizador_texto(texto, nlp, doc=None):
     """
     Normaliza texto: lematiza, elimina repeticiones y corrige palabras.
     
     Args:
         texto (str): Texto original a procesar.
         nlp: Pipeline spaCy para lematización.
+        doc (Doc, opcional): `texto` ya procesado por `nlp`.
     
     Returns:
         tuple: (original, lematizado, sin_repeticiones, corregido)
@@ -264,14 +509,12 @@ def normalizador_texto(texto, nlp):
     if not texto or len(texto.strip()) == 0:
         return None
     if nlp is None:
-        palabras = texto.split()
-        sin_repeticiones = " ".join([palabras[i] for i in range(len(palabras)) if i == 0 or palabras[i].lower() != palabras[i-1].lower()])
-        return {"original": texto, "lematizado": "(spaCy requerido)", "sin_repeticiones": sin_repeticiones, "corregido": "(spaCy requerido)"}
-    doc = nlp(texto)
+        sin_repeticiones = _RE_DUP.sub(r"\1", texto)
+        return {"original": texto, "lematizado": "(spaCy requerido)", "sin_repeticiones": sin_repeticiones, "corregido": corregir_palabras(texto)}
+    doc = procesar_spacy(nlp, texto, "normalizador", doc)
     lematizado = " ".join([t.lemma_ for t in doc])
-    palabras = texto.split()
-    sin_repeticiones = " ".join([palabras[i] for i in range(len(palabras)) if i == 0 or palabras[i].lower() != palabras[i-1].lower()])
-    texto_corregido = corregir_palabras(doc)
+    sin_repeticiones = _RE_DUP.sub(r"\1", texto)
+    texto_corregido = corregir_palabras(texto)
     return {"original": texto, "lematizado": lematizado, "sin_repeticiones": sin_repeticiones, "corregido": texto_corregido}
 
 
@@ -282,10 +525,17 @@ def normalizador_texto(texto, nlp):
 PATRON_FECHAS = r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b"
 PATRON_DINERO = r"\b(?:€?\s?\d{1,3}(?:[\.,]\d{3})*(?:[\.,]\d+)?\s?(?:€|euros|USD|\$)|\$\d+(?:\.\d+)?\b)"
 PATRON_EMAIL = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
-
-# Funciones para buscar patrones en texto usando re.findall
-def encontrar_fechas(texto): return re.findall(PATRON_FECHAS, texto)
-"""
+# Versiones compiladas una sola vez al importar el módulo
+RE_FECHAS = re.compile(PATRON_FECHAS)
+RE_DINERO = re.compile(PATRON_DINERO)
+RE_EMAIL = re.compile(PATRON_EMAIL)
+# Los tres patrones en una sola alternancia con grupos con nombre, para
+# recorrer el texto una única vez (ver `encontrar_todo`)
+RE_PATRONES = re.compile(f"(?P<fecha>{PATRON_FECHAS})|(?P<dinero>{PATRON_DINERO})|(?P<email>{PATRON_EMAIL})")
+
+# Funciones para buscar patrones en texto usando los patrones compilados
+def encontrar_fechas(texto):
+    """
     Extrae patrones de fechas del texto usando expresiones regulares.
     
     Args:
@@ -294,8 +544,10 @@ def encontrar_fechas(texto): return re.findall(PATRON_FECHAS, texto)
     Returns:
         list[str]: Lista de fechas encontradas.
     """
-def encontrar_dinero(texto): return re.findall(PATRON_DINERO, texto)
-"""
+    return RE_FECHAS.findall(texto)
+
+def encontrar_dinero(texto):
+    """
     Extrae patrones monetarios (euros, USD) del texto.
     
     Args:
@@ -304,8 +556,10 @@ def encontrar_dinero(texto): return re.findall(PATRON_DINERO, texto)
     Returns:
         list[str]: Lista de cantidades monetarias.
     """
-def encontrar_correos(texto): return re.findall(PATRON_EMAIL, texto)
-"""
+    return RE_DINERO.findall(texto)
+
+def encontrar_correos(texto):
+    """
     Extrae direcciones de email del texto.
     
     Args:
@@ -314,12 +568,57 @@ def encontrar_correos(texto): return re.findall(PATRON_EMAIL, texto)
     Returns:
         list[str]: Lista de correos electrónicos.
     """
+    return RE_EMAIL.findall(texto)
+
+def encontrar_todo(texto):
+    """
+    Extrae fechas, cantidades monetarias y correos en una sola pasada.
+
+    Usa `RE_PATRONES` y clasifica cada coincidencia por el grupo que la
+    produjo. Si dos patrones se solapan en el texto, gana el primero que
+    empieza antes.
+
+    Args:
+        texto (str): Texto a analizar.
+
+    Returns:
+        tuple[list[str], list[str], list[str]]: (fechas, dinero, correos).
+    """
+    fechas, dinero, correos = [], [], []
+    destino = {"fecha": fechas, "dinero": dinero, "email": correos}
+    for m in RE_PATRONES.finditer(texto):
+        destino[m.lastgroup].append(m.group())
+    return fechas, dinero, correos
 
 # ----------------------
 # Resumen simple
 # ----------------------
+# Oraciones (hasta `.`, `!`, `?` o salto de línea) y palabras para el modo sin spaCy
+_RE_SENT = re.compile(r'[^.!?\n]+[.!?]?')
+# Palabras de más de dos caracteres: \w{3,} equivale a filtrar \w+ por longitud
+_RE_PALABRA_LARGA = re.compile(r"\w{3,}")
+
+# A partir de este número de oraciones compensa pasar las puntuaciones a NumPy
+_UMBRAL_NUMPY = 256
+
+# Índices (en orden de aparición) de las `n` oraciones con más puntuación.
+# En caso de empate gana la que aparece antes, con o sin NumPy
+def _mejores_indices(puntuaciones, n):
+    if n <= 0:
+        return []
+    np = _importar("numpy") if len(puntuaciones) >= _UMBRAL_NUMPY else None
+    if np is not None:
+        scores = np.asarray(puntuaciones, dtype=np.float64)
+        # Selección en O(len) con np.partition en vez de ordenar;
+        # los empates en el umbral se resuelven por posición
+        umbral = np.partition(scores, -n)[-n]
+        mayores = np.flatnonzero(scores > umbral)
+        empates = np.flatnonzero(scores == umbral)[:n - len(mayores)]
+        return np.sort(np.concatenate((mayores, empates))).tolist()
+    return sorted(heapq.nlargest(n, range(len(puntuaciones)), key=puntuaciones.__getitem__))
+
 # Extrae un resumen simple basado en relevancia de oraciones que contienen sustantivos
-def resumen_simple(texto, n=3, nlp=None):
+def resumen_simple(texto, n=3, nlp=None, doc=None):
     """
     Genera resumen automático extrayendo oraciones más relevantes.
     
@@ -327,47 +626,58 @@ def resumen_simple(texto, n=3, nlp=None):
         texto (str): Texto original.
         n (int): Número máximo de oraciones en resumen.
         nlp: Pipeline spaCy opcional.
+        doc (Doc, opcional): `texto` ya procesado por `nlp`.
     
     Returns:
         str: Resumen conciso del texto.
     """
     if not texto or not texto.strip():
         return "Error: texto vacío."
-    oraciones = list(nlp(texto).sents) if nlp else [s.strip() for s in texto.split('.') if s.strip()]
+    if nlp:
+        oraciones = list(procesar_spacy(nlp, texto, "resumen", doc).sents)
+    else:
+        oraciones = [s for s in (m.group().strip() for m in _RE_SENT.finditer(texto)) if s]
     if len(oraciones) <= n:
         return texto
     puntuaciones = []
     for i, oracion in enumerate(oraciones):
         puntaje = 0
-        tokens = oracion if nlp else re.findall(r"\w+", oracion)
         if nlp:
-            sustantivos = [t for t in oracion if t.pos_ == "NOUN"]
-            puntaje += len(sustantivos)
+            # Se cuentan los sustantivos sin construir una lista solo para medirla
+            puntaje += sum(t.pos_ == "NOUN" for t in oracion)
             longitud = len(oracion.text)
         else:
-            sustantivos = [w for w in tokens if len(w) > 2]
-            puntaje += len(sustantivos)
+            puntaje += len(_RE_PALABRA_LARGA.findall(oracion))
             longitud = len(oracion)
         puntaje -= longitud / 200.0
         if i == 0:
             puntaje += 1
-        puntuaciones.append((i, puntaje))
-    mejores = sorted(puntuaciones, key=lambda x: x[1], reverse=True)[:n]
-    indices = sorted([idx for idx, _ in mejores])
+        puntuaciones.append(puntaje)
+    indices = _mejores_indices(puntuaciones, n)
     return " ".join(oraciones[i].text.strip() if nlp else oraciones[i] for i in indices)
 
 
 # ----------------------
 # Extracción NER
 # ----------------------
+# Etiqueta de spaCy -> nombre del grupo en el resultado (en este orden)
+_ETIQUETAS_NER = {
+    'PER': 'Personas',
+    'LOC': 'Lugares',
+    'ORG': 'Empresas',
+    'DATE': 'Fechas',
+    'QUANTITY': 'Cantidades',
+}
+
 # Extrae entidades nombradas del texto con spaCy, clasificando en categorías relevantes
-def extraer_entidades(texto, nlp):
+def extraer_entidades(texto, nlp, doc=None):
     """
     Extrae entidades nombradas (NER) clasificadas por tipo.
     
     Args:
         texto (str): Texto a analizar.
         nlp: Pipeline spaCy.
+        doc (Doc, opcional): `texto` ya procesado por `nlp`.
     
     Returns:
         dict: {'Personas': [...], 'Lugares': [...], ...}
@@ -375,28 +685,45 @@ def extraer_entidades(texto, nlp):
     if nlp is None:
         print("Aviso: spaCy no disponible — NER no puede ejecutarse.")
         return {}
-    doc = nlp(texto)
-    def extraer(tipo): return [ent.text for ent in doc.ents if ent.label_ == tipo]
-    return {
-        'Personas': sorted(set(extraer('PER'))),
-        'Lugares': sorted(set(extraer('LOC'))),
-        'Empresas': sorted(set(extraer('ORG'))),
-        'Fechas': sorted(set(extraer('DATE'))),
-        'Cantidades': sorted(set([ent.text for ent in doc.ents if ent.label_ == 'QUANTITY']))
-    }
+    doc = procesar_spacy(nlp, texto, "ner", doc)
+    # Una sola pasada por las entidades: cada etiqueta lleva directamente a
+    # su conjunto (una búsqueda por entidad); las que no se muestran
+    # (MISC...) se descartan
+    conjuntos = {etiqueta: set() for etiqueta in _ETIQUETAS_NER}
+    for ent in doc.ents:
+        conjunto = conjuntos.get(ent.label_)
+        if conjunto is not None:
+            conjunto.add(ent.text)
+    # sorted() sobre el conjunto ya da la lista final
+    return {grupo: sorted(conjuntos[etiqueta]) for etiqueta, grupo in _ETIQUETAS_NER.items()}
 
 
 # ----------------------
 # Palabras clave - Marius
 # ----------------------
+# Tokens alfanuméricos de 3 o más caracteres (equivale a `isalnum()` y
+# `len > 2` sobre cada palabra, sin pasar por `word_tokenize`)
+RE_TOKEN = re.compile(r"[^\W_]{3,}")
+# Stopwords en español; se cargan en la primera llamada (tras `inicializar_nltk`)
+# como frozenset inmutable, compartido entre llamadas (y entre hilos de la GUI)
+_STOPWORDS_ES = None
+
+
+def _stopwords_es():
+    global _STOPWORDS_ES
+    if _STOPWORDS_ES is None:
+        from nltk.corpus import stopwords
+        _STOPWORDS_ES = frozenset(stopwords.words('spanish'))
+    return _STOPWORDS_ES
+
 # Extrae palabras clave usando nltk para filtrar stopwords y spaCy para sustantivos y verbos
-def extraer_palabras_clave(texto, nlp=None):
+def extraer_palabras_clave(texto, nlp=None, doc=None):
     """
         Extrae palabras clave relevantes de un texto en español.
 
         Proceso:
-        - Usa NLTK para tokenizar y calcular las `top_5_palabras` (eliminando
-            stopwords en español y tokens no alfanuméricos).
+        - Tokeniza con la expresión regular `RE_TOKEN` y usa las stopwords
+            de NLTK (cacheadas) para calcular las `top_5_palabras`.
         - Si se proporciona un objeto `nlp` de spaCy, extrae los sustantivos
             y verbos principales (parte del discurso POS) y devuelve sus
             frecuencias.
@@ -404,6 +731,7 @@ def extraer_palabras_clave(texto, nlp=None):
         Parámetros:
         - texto (str): texto de entrada. Si está vacío, devuelve `None`.
         - nlp (spaCy Language, opcional): objeto spaCy para análisis morfosintáctico.
+        - doc (Doc, opcional): `texto` ya procesado por `nlp`.
 
         Retorna:
         dict con claves:
@@ -417,18 +745,24 @@ def extraer_palabras_clave(texto, nlp=None):
         """
     if not texto or not texto.strip():
         return None
-    tokens_filtrados, sustantivos_relevantes, verbos_principales = [], [], []
-    if nltk:
-        tokens = word_tokenize(texto.lower())
-        stopwords_es = set(stopwords.words('spanish'))
-        tokens_filtrados = [t for t in tokens if t.isalnum() and t not in stopwords_es and len(t) > 2]
-        top_5 = Counter(tokens_filtrados).most_common(5)
+    sustantivos_relevantes, verbos_principales = [], []
+    if _importar("nltk") is not None:
+        stopwords_es = _stopwords_es()
+        top_5 = Counter(t for t in RE_TOKEN.findall(texto.lower()) if t not in stopwords_es).most_common(5)
     else:
         top_5 = []
     if nlp:
-        doc = nlp(texto)
-        sustantivos_relevantes = Counter([t.text for t in doc if t.pos_ == 'NOUN']).most_common(5)
-        verbos_principales = Counter([t.text for t in doc if t.pos_ == 'VERB']).most_common(5)
+        doc = procesar_spacy(nlp, texto, "palabras_clave", doc)
+        # Una sola pasada sobre el doc para sustantivos y verbos
+        sustantivos, verbos = Counter(), Counter()
+        for t in doc:
+            pos = t.pos_
+            if pos == 'NOUN':
+                sustantivos[t.text] += 1
+            elif pos == 'VERB':
+                verbos[t.text] += 1
+        sustantivos_relevantes = sustantivos.most_common(5)
+        verbos_principales = verbos.most_common(5)
     return {
         'top_5_palabras': top_5, 
         'sustantivos': sustantivos_relevantes, 
@@ -439,31 +773,120 @@ def extraer_palabras_clave(texto, nlp=None):
 # ----------------------
 # Sentimiento
 # ----------------------
+# Tamaño máximo de cada trozo enviado al modelo: ~1500 caracteres son unos
+# 400 tokens, por debajo del límite de 512 de los modelos BERT
+_MAX_CHARS_TROZO = 1500
+
+# Agrupa oraciones consecutivas en trozos de hasta `max_chars` caracteres;
+# una oración más larga se corta por espacios para que el modelo no la trunque
+def _trozos_sentimiento(oraciones, max_chars=_MAX_CHARS_TROZO):
+    trozos, actual, largo = [], [], 0
+    for oracion in oraciones:
+        if len(oracion) > max_chars:
+            # Lo pendiente va antes que los trozos de la oración larga
+            if actual:
+                trozos.append(" ".join(actual))
+                actual, largo = [], 0
+            while len(oracion) > max_chars:
+                corte = oracion.rfind(" ", 0, max_chars)
+                if corte <= 0:
+                    corte = max_chars
+                trozos.append(oracion[:corte].rstrip())
+                oracion = oracion[corte:].lstrip()
+        if actual and largo + 1 + len(oracion) > max_chars:
+            trozos.append(" ".join(actual))
+            actual, largo = [], 0
+        if oracion:
+            largo += len(oracion) + (1 if actual else 0)
+            actual.append(oracion)
+    if actual:
+        trozos.append(" ".join(actual))
+    return trozos
+
 # Determina sentimiento del texto como positivo, neutral o negativo con modelo transformers
-def sentimiento_es(texto, clasificador):
+def sentimiento_es(texto, clasificador, doc=None):
     """
-    Analiza el sentimiento usando el modelo multilingual-uncased de Nlptown.
+    Analiza el sentimiento con el clasificador de `inicializar_sentimiento`
+    (BETO o, si no está disponible, el multilingual-uncased de Nlptown).
+
+    El texto se divide en oraciones (las de `doc` si se da, si no con
+    `_RE_SENT`), que se agrupan en trozos de hasta `_MAX_CHARS_TROZO`
+    caracteres (ver `_trozos_sentimiento`) y se clasifican juntos en un
+    solo lote. Así un texto largo no se trunca al máximo de tokens del
+    modelo y el coste crece de forma lineal con su longitud. La etiqueta
+    final es la que más texto cubre (votos ponderados por longitud) y el
+    score la media ponderada de los trozos con esa etiqueta.
 
     Retorna:
         - sentimiento: "Positivo", "Negativo", "Neutral" o "Error"
         - score: confianza (0–1)
-        - etiqueta_raw: etiqueta original del modelo (ej. "4 stars")
-        - valor_continuo: valor normalizado (-1 a 1)
+        - etiqueta_raw: etiqueta original del modelo (ej. "POS" o "4 stars")
     """
-    if not texto or not texto.strip():
-        return "Error: texto vacío.", 0.0, ""
-    if clasificador is None:
-        return "Error: transformers no instalado.", 0.0, "transformers missing"
-    try:
-        resultado = clasificador(texto)[0]
-        etiqueta = resultado.get('label', '')
-        puntuacion = resultado.get('score', 0.0)
-        if "1" in etiqueta or "2" in etiqueta:
-            sentimiento = "Negativo"
-        elif "3" in etiqueta:
-            sentimiento = "Neutral"
+    if not texto or not texto.strip() or clasificador is None:
+        return sentimiento_es_batch([texto], clasificador)[0]
+    if doc is not None:
+        oraciones = [s.text.strip() for s in doc.sents]
+    else:
+        oraciones = [m.group().strip() for m in _RE_SENT.finditer(texto)]
+    trozos = _trozos_sentimiento([o for o in oraciones if o] or [texto.strip()])
+    resultados = sentimiento_es_batch(trozos, clasificador)
+    if len(resultados) == 1 or resultados[0][0] == "Error":
+        return resultados[0]
+    # Peso (longitud) y suma de scores ponderados por etiqueta
+    pesos, scores = Counter(), Counter()
+    for trozo, (_, score, etiqueta) in zip(trozos, resultados):
+        pesos[etiqueta] += len(trozo)
+        scores[etiqueta] += score * len(trozo)
+    etiqueta = max(pesos, key=pesos.__getitem__)
+    return (_etiqueta_a_sentimiento(etiqueta), scores[etiqueta] / pesos[etiqueta], etiqueta)
+
+
+# Etiquetas del modelo BETO
+_ETIQUETAS_BETO = {"NEG": "Negativo", "NEU": "Neutral", "POS": "Positivo"}
+
+# Traduce la etiqueta del modelo (NEG/NEU/POS o "1 star" ... "5 stars") a sentimiento
+def _etiqueta_a_sentimiento(etiqueta):
+    sentimiento = _ETIQUETAS_BETO.get(etiqueta)
+    if sentimiento is not None:
+        return sentimiento
+    if "1" in etiqueta or "2" in etiqueta:
+        return "Negativo"
+    if "3" in etiqueta:
+        return "Neutral"
+    return "Positivo"
+
+
+# Analiza varios textos en una sola llamada al clasificador (inferencia por lotes)
+def sentimiento_es_batch(textos, clasificador, batch_size=32):
+    """
+    Versión por lotes de `sentimiento_es`.
+
+    Todos los textos válidos se pasan juntos al pipeline con `batch_size`,
+    lo que amortiza el coste fijo por llamada y permite batching en GPU.
+    Los textos más largos que el modelo se truncan.
+
+    Retorna:
+        list[tuple]: una tupla (sentimiento, score, etiqueta_raw) por texto,
+        en el mismo orden y con los mismos valores de error que `sentimiento_es`.
+    """
+    resultados = [None] * len(textos)
+    validos = []
+    for i, texto in enumerate(textos):
+        if not texto or not texto.strip():
+            resultados[i] = ("Error: texto vacío.", 0.0, "")
+        elif clasificador is None:
+            resultados[i] = ("Error: transformers no instalado.", 0.0, "transformers missing")
         else:
-            sentimiento = "Positivo"
-        return sentimiento, puntuacion, etiqueta
+            validos.append(i)
+    if not validos:
+        return resultados
+    try:
+        salidas = clasificador([textos[i] for i in validos], batch_size=batch_size, truncation=True)
+        for i, resultado in zip(validos, salidas):
+            etiqueta = resultado.get('label', '')
+            puntuacion = resultado.get('score', 0.0)
+            resultados[i] = (_etiqueta_a_sentimiento(etiqueta), puntuacion, etiqueta)
     except Exception as e:
-        return "Error", 0.0, str(e)
+        for i in validos:
+            resultados[i] = ("Error", 0.0, str(e))
+    return resultados
@@ -1,10 +1,15 @@
+import functools
+import hashlib
+import os
+import sys
+import threading
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 from wordChef import (
     normalizador_texto,
-    encontrar_fechas,
-    encontrar_dinero,
-    encontrar_correos,
+    encontrar_todo,
     resumen_simple,
     extraer_entidades,
     extraer_palabras_clave,
@@ -16,6 +21,9 @@ from wordChef import (
     leer_archivo
 )
 
+# Número de resultados de análisis que se guardan (ver `_en_segundo_plano`)
+MAX_RESULTADOS = 32
+
 
 class WorldChefGUI:
     def __init__(self, root):
@@ -32,10 +40,26 @@ class WorldChefGUI:
                   background=[('active', '#45a049')],
                   foreground=[('active', 'white')])
         
-        # Inicializamos modelos
-        self.nlp = cargar_modelo_spacy()
-        inicializar_nltk()
-        self.clasificador_sentimiento = inicializar_sentimiento()
+        # Los modelos se cargan la primera vez que una pestaña los necesita
+        # (ver `nlp` y `clasificador_sentimiento`); así Patrones funciona
+        # sin esperar a spaCy ni a descargar el modelo de sentimiento
+        self._modelos = {}
+        # Un lock por modelo (el de `_lock_modelos` solo protege este dict):
+        # cargar spaCy no hace esperar a la carga del modelo de sentimiento
+        self._locks_modelos = {}
+        self._lock_modelos = threading.Lock()
+        # El análisis (y la carga de modelos) corre en estos hilos para no
+        # bloquear la interfaz; los resultados se pintan desde el hilo de Tk
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wordChef")
+        # spaCy no admite llamadas concurrentes al mismo pipeline
+        self._lock_nlp = threading.Lock()
+        # Últimos textos procesados por spaCy: las pestañas que analizan el
+        # mismo texto comparten el Doc en vez de volver a procesarlo
+        self._doc = functools.lru_cache(maxsize=8)(self._procesar)
+        # Resultados ya calculados por (análisis, hash del texto), del más
+        # antiguo al más reciente; repetir un análisis no vuelve a ejecutarlo
+        self._resultados = OrderedDict()
+        self._lock_resultados = threading.Lock()
         
         # Frame superior: Entrada de texto y cargar archivo
         frame_top = tk.Frame(root)
@@ -89,6 +113,105 @@ class WorldChefGUI:
         self._setup_ner()
         self._setup_keywords()
         self._setup_sentimiento()
+        
+        # spaCy lo usan casi todas las pestañas: se empieza a cargar ya,
+        # en segundo plano, mientras el usuario escribe
+        self._pool.submit(self._modelo, "spacy", cargar_modelo_spacy)
+        self.root.protocol("WM_DELETE_WINDOW", self._cerrar)
+    
+    # Al cerrar la ventana se cancelan los análisis pendientes, se vuelca y
+    # cierra el log (con espera acotada) y se termina el proceso. Los hilos
+    # del pool no son daemon y el intérprete los espera al salir: sin
+    # `os._exit`, una carga de modelo en curso (que con la descarga y la
+    # cuantización del de sentimiento puede durar minutos) dejaría el
+    # proceso vivo sin ventana
+    def _cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if logger.flush(timeout=1.0):
+            logger.close()
+        self.root.destroy()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+    
+    # Carga perezosa: ejecuta `cargador` una sola vez y guarda su resultado
+    # (aunque sea None, para no reintentar una carga fallida en cada clic).
+    # Se llama desde los hilos del pool; el lock de cada clave evita cargar
+    # dos veces el mismo modelo sin bloquear la carga de los demás
+    def _modelo(self, clave, cargador):
+        if clave in self._modelos:
+            return self._modelos[clave]
+        with self._lock_modelos:
+            lock = self._locks_modelos.setdefault(clave, threading.Lock())
+        with lock:
+            if clave not in self._modelos:
+                self._modelos[clave] = cargador()
+            return self._modelos[clave]
+    
+    @property
+    def nlp(self):
+        return self._modelo("spacy", cargar_modelo_spacy)
+    
+    # Doc con el pipeline completo (o None sin spaCy); usar vía `self._doc`
+    def _procesar(self, texto):
+        nlp = self.nlp
+        if nlp is None:
+            return None
+        with self._lock_nlp:
+            return nlp(texto)
+    
+    @property
+    def clasificador_sentimiento(self):
+        return self._modelo("sentimiento", inicializar_sentimiento)
+    
+    # Ejecuta `tarea()` en el pool y después `mostrar(resultado)` en el hilo
+    # de Tk (Tk no es seguro entre hilos: se consulta el futuro con `after`).
+    # Con `clave=(análisis, texto)` el resultado se guarda y, si ya estaba,
+    # se muestra directamente sin pasar por el pool
+    def _en_segundo_plano(self, tarea, mostrar, clave=None):
+        if clave is not None:
+            analisis, texto = clave
+            clave = (analisis, hashlib.blake2b(texto.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+            # Solo la consulta va bajo el lock; `mostrar` (Tk y log) va fuera
+            with self._lock_resultados:
+                encontrado = clave in self._resultados
+                if encontrado:
+                    self._resultados.move_to_end(clave)
+                    resultado = self._resultados[clave]
+            if encontrado:
+                mostrar(resultado)
+                return
+            tarea = functools.partial(self._guardar_resultado, clave, tarea)
+        self.status_label.config(text="⏳ Procesando...", fg="#FF9800")
+        futuro = self._pool.submit(tarea)
+        self.root.after(50, self._al_terminar, futuro, mostrar)
+    
+    # Ejecuta `tarea()` (en el pool) y guarda su resultado, descartando el más antiguo
+    def _guardar_resultado(self, clave, tarea):
+        resultado = tarea()
+        with self._lock_resultados:
+            self._resultados[clave] = resultado
+            if len(self._resultados) > MAX_RESULTADOS:
+                self._resultados.popitem(last=False)
+        return resultado
+    
+    def _al_terminar(self, futuro, mostrar):
+        if not futuro.done():
+            self.root.after(50, self._al_terminar, futuro, mostrar)
+            return
+        self.status_label.config(text="✅ Listo", fg="green")
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        mostrar(resultado)
+    
+    # Sustituye el contenido de un área de resultados con una sola inserción
+    # (cada llamada a Tk pasa por el intérprete de Tcl)
+    def _mostrar(self, area, texto):
+        area.delete("1.0", tk.END)
+        area.insert(tk.END, texto)
     
     # Limpiar Todo
     def limpiar_todo(self):
@@ -132,13 +255,17 @@ class WorldChefGUI:
         if not texto:
             messagebox.showwarning("Aviso", "Introduce un texto primero.")
             return
-        res = normalizador_texto(texto, self.nlp)
-        self.normalizador_output.delete("1.0", tk.END)
-        self.normalizador_output.insert(tk.END, f"Original:\n{res['original']}\n\n")
-        self.normalizador_output.insert(tk.END, f"Lematizado:\n{res['lematizado']}\n\n")
-        self.normalizador_output.insert(tk.END, f"Sin repeticiones:\n{res['sin_repeticiones']}\n\n")
-        self.normalizador_output.insert(tk.END, f"Corregido:\n{res['corregido']}\n")
-        logger.log("Normalizador", texto, res)
+        
+        def mostrar(res):
+            self._mostrar(self.normalizador_output,
+                          f"Original:\n{res['original']}\n\n"
+                          f"Lematizado:\n{res['lematizado']}\n\n"
+                          f"Sin repeticiones:\n{res['sin_repeticiones']}\n\n"
+                          f"Corregido:\n{res['corregido']}\n")
+            logger.log("Normalizador", texto, res)
+        
+        self._en_segundo_plano(lambda: normalizador_texto(texto, self.nlp, doc=self._doc(texto)), mostrar,
+                               clave=("normalizador", texto))
     
     def _setup_patrones(self):
         btn = tk.Button(self.tab_patrones, text="Buscar Patrones", command=self.run_patrones,
@@ -149,13 +276,11 @@ class WorldChefGUI:
     
     def run_patrones(self):
         texto = self.get_texto()
-        fechas = encontrar_fechas(texto)
-        dinero = encontrar_dinero(texto)
-        correos = encontrar_correos(texto)
-        self.patrones_output.delete("1.0", tk.END)
-        self.patrones_output.insert(tk.END, f"Fechas: {fechas or 'Ninguna'}\n")
-        self.patrones_output.insert(tk.END, f"Dinero: {dinero or 'Ninguno'}\n")
-        self.patrones_output.insert(tk.END, f"Correos: {correos or 'Ninguno'}\n")
+        fechas, dinero, correos = encontrar_todo(texto)
+        self._mostrar(self.patrones_output,
+                      f"Fechas: {fechas or 'Ninguna'}\n"
+                      f"Dinero: {dinero or 'Ninguno'}\n"
+                      f"Correos: {correos or 'Ninguno'}\n")
         logger.log("Patrones", texto, {"Fechas": fechas, "Dinero": dinero, "Correos": correos})
     
     def _setup_resumen(self):
@@ -167,10 +292,13 @@ class WorldChefGUI:
     
     def run_resumen(self):
         texto = self.get_texto()
-        resumen = resumen_simple(texto, n=3, nlp=self.nlp)
-        self.resumen_output.delete("1.0", tk.END)
-        self.resumen_output.insert(tk.END, resumen)
-        logger.log("Resumen", texto, {"Resumen": resumen})
+        
+        def mostrar(resumen):
+            self._mostrar(self.resumen_output, resumen)
+            logger.log("Resumen", texto, {"Resumen": resumen})
+        
+        self._en_segundo_plano(lambda: resumen_simple(texto, n=3, nlp=self.nlp, doc=self._doc(texto)), mostrar,
+                               clave=("resumen", texto))
     
     def _setup_ner(self):
         btn = tk.Button(self.tab_ner, text="Extraer Entidades", command=self.run_ner,
@@ -181,11 +309,14 @@ class WorldChefGUI:
     
     def run_ner(self):
         texto = self.get_texto()
-        entidades = extraer_entidades(texto, self.nlp)
-        self.ner_output.delete("1.0", tk.END)
-        for k, v in entidades.items():
-            self.ner_output.insert(tk.END, f"{k}: {v if v else 'Ninguno detectado'}\n")
-        logger.log("NER", texto, entidades)
+        
+        def mostrar(entidades):
+            self._mostrar(self.ner_output,
+                          "".join(f"{k}: {v if v else 'Ninguno detectado'}\n" for k, v in entidades.items()))
+            logger.log("NER", texto, entidades)
+        
+        self._en_segundo_plano(lambda: extraer_entidades(texto, self.nlp, doc=self._doc(texto)), mostrar,
+                               clave=("ner", texto))
     
     def _setup_keywords(self):
         btn = tk.Button(self.tab_keywords, text="Extraer Palabras Clave", command=self.run_keywords,
@@ -196,12 +327,19 @@ class WorldChefGUI:
     
     def run_keywords(self):
         texto = self.get_texto()
-        resultado = extraer_palabras_clave(texto, nlp=self.nlp)
-        self.keywords_output.delete("1.0", tk.END)
-        self.keywords_output.insert(tk.END, f"Top 5 palabras: {resultado['top_5_palabras']}\n")
-        self.keywords_output.insert(tk.END, f"Sustantivos: {resultado['sustantivos']}\n")
-        self.keywords_output.insert(tk.END, f"Verbos: {resultado['verbos']}\n")
-        logger.log("Palabras clave", texto, resultado)
+        
+        def tarea():
+            self._modelo("nltk", inicializar_nltk)
+            return extraer_palabras_clave(texto, nlp=self.nlp, doc=self._doc(texto))
+        
+        def mostrar(resultado):
+            self._mostrar(self.keywords_output,
+                          f"Top 5 palabras: {resultado['top_5_palabras']}\n"
+                          f"Sustantivos: {resultado['sustantivos']}\n"
+                          f"Verbos: {resultado['verbos']}\n")
+            logger.log("Palabras clave", texto, resultado)
+        
+        self._en_segundo_plano(tarea, mostrar, clave=("palabras_clave", texto))
     
     def _setup_sentimiento(self):
         btn = tk.Button(self.tab_sentimiento, text="Analizar Sentimiento", command=self.run_sentimiento,
@@ -212,10 +350,14 @@ class WorldChefGUI:
     
     def run_sentimiento(self):
         texto = self.get_texto()
-        sentimiento, score, raw = sentimiento_es(texto, self.clasificador_sentimiento)
-        self.sentimiento_output.delete("1.0", tk.END)
-        self.sentimiento_output.insert(tk.END, f"Resultado: {sentimiento}\nConfianza: {score:.4f}\nEstrellas: {raw}\n")
-        logger.log("Sentimiento", texto, {"Sentimiento": sentimiento, "Confianza": f"{score:.4f}", "Etiqueta": raw})
+        
+        def mostrar(res):
+            sentimiento, score, raw = res
+            self._mostrar(self.sentimiento_output, f"Resultado: {sentimiento}\nConfianza: {score:.4f}\nEtiqueta: {raw}\n")
+            logger.log("Sentimiento", texto, {"Sentimiento": sentimiento, "Confianza": f"{score:.4f}", "Etiqueta": raw})
+        
+        self._en_segundo_plano(lambda: sentimiento_es(texto, self.clasificador_sentimiento), mostrar,
+                               clave=("sentimiento", texto))
 
 
 if __name__ == "__main__":